@@ -2,8 +2,8 @@ const mlService = require('../services/mlService');
 
 exports.getForecast = async (req, res) => {
   try {
-    const { horizon = 60 } = req.query;
-    const forecast = await mlService.getForecast(null, parseInt(horizon));
+    const { horizon = 60, samples = 0 } = req.query;
+    const forecast = await mlService.getForecast(null, parseInt(horizon), parseInt(samples) || 0);
     res.json(forecast);
   } catch (err) {
     console.error('Forecast error:', err);
@@ -14,8 +14,8 @@ exports.getForecast = async (req, res) => {
 exports.getNodeForecast = async (req, res) => {
   try {
     const { nodeId } = req.params;
-    const { horizon = 60 } = req.query;
-    const forecast = await mlService.getForecast(nodeId, parseInt(horizon));
+    const { horizon = 60, samples = 0 } = req.query;
+    const forecast = await mlService.getForecast(nodeId, parseInt(horizon), parseInt(samples) || 0);
     res.json(forecast);
   } catch (err) {
     console.error('Node forecast error:', err);
@@ -53,11 +53,12 @@ function fallbackAnomalyDetection(reading) {
   };
 }
 
-async function getForecast(nodeId, horizon = 60) {
+async function getForecast(nodeId, horizon = 60, samples = 0) {
   try {
+    const params = `horizon=${horizon}` + (samples ? `&samples=${samples}` : '');
     const url = nodeId 
-      ? `${ML_SERVICE_URL}/forecast/${nodeId}?horizon=${horizon}`
-      : `${ML_SERVICE_URL}/forecast?horizon=${horizon}`;
+      ? `${ML_SERVICE_URL}/forecast/${nodeId}?${params}`
+      : `${ML_SERVICE_URL}/forecast?${params}`;
       
     const response = await fetch(url);
     
@@ -39,6 +39,12 @@ export interface AnomalyData {
   stressIndex: number;
 }
 
+export interface ForecastBand {
+  p10: number;
+  p50: number;
+  p90: number;
+}
+
 export interface ForecastData {
   node_id: string;
   node_name: string;
@@ -51,6 +57,7 @@ export interface ForecastData {
     predicted_aqi: number;
     predicted_crowd: number;
     confidence: number;
+    intervals?: Record<'noise' | 'temp' | 'aqi' | 'crowd' | 'stress', ForecastBand>;
   }>;
   trend: 'increasing' | 'decreasing' | 'stable';
 }
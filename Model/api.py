@@ -4,13 +4,25 @@ from dotenv import load_dotenv
 
 from inference.anomaly_detector import AnomalyDetector
 from inference.forecaster import Forecaster
+from inference.batcher import DetectionBatcher
 
 load_dotenv()
 
 app = Flask(__name__)
 
-anomaly_detector = AnomalyDetector()
+score_percentile = os.environ.get('ANOMALY_SCORE_PERCENTILE')
+anomaly_detector = AnomalyDetector(
+    score_percentile=float(score_percentile) if score_percentile else None,
+    min_sketch_count=int(os.environ.get('ANOMALY_SKETCH_MIN_COUNT', 500))
+)
 forecaster = Forecaster()
+detect_batcher = DetectionBatcher(
+    anomaly_detector.detect_batch,
+    # A batch fills only if that many requests run concurrently, so this
+    # defaults to the gunicorn thread count (GUNICORN_THREADS)
+    max_batch_size=int(os.environ.get('DETECT_MAX_BATCH_SIZE', os.environ.get('GUNICORN_THREADS', 16))),
+    max_wait_ms=float(os.environ.get('DETECT_MAX_WAIT_MS', 5))
+)
 
 @app.route('/health', methods=['GET'])
 def health():
@@ -18,20 +30,57 @@ def health():
 
 @app.route('/detect', methods=['POST'])
 def detect_anomaly():
-    data = request.json
-    result = anomaly_detector.detect(data)
+    data = request.get_json(silent=True)
+    try:
+        result = detect_batcher.detect(data)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     return jsonify(result)
 
+@app.route('/detect/stats', methods=['GET'])
+def detect_stats():
+    return jsonify(detect_batcher.stats())
+
+@app.route('/detect/score-percentiles', methods=['GET', 'POST'])
+def detect_score_percentiles():
+    # POST {"flag_percentile": 99} recalibrates live; null restores the model
+    # threshold. {"reset": true} drops the score history and starts afresh.
+    if request.method == 'POST':
+        body = request.get_json(silent=True)
+        body = body if isinstance(body, dict) else {}
+        reset = body.get('reset', False)
+        if not isinstance(reset, bool):
+            return jsonify({'status': 'error', 'message': 'reset must be true or false'}), 400
+        if 'flag_percentile' in body:
+            try:
+                anomaly_detector.set_score_percentile(body['flag_percentile'])
+            except ValueError as e:
+                return jsonify({'status': 'error', 'message': str(e)}), 400
+        if reset:
+            anomaly_detector.reset_score_sketches()
+    return jsonify({
+        'flag_percentile': anomaly_detector.score_percentile,
+        'zones': anomaly_detector.score_percentiles()
+    })
+
 @app.route('/forecast', methods=['GET'])
 def forecast_all():
     horizon = request.args.get('horizon', 60, type=int)
-    result = forecaster.predict(None, horizon)
+    samples = request.args.get('samples', 0, type=int)
+    try:
+        result = forecaster.predict(None, horizon, samples=samples)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     return jsonify(result)
 
 @app.route('/forecast/<node_id>', methods=['GET'])
 def forecast_node(node_id):
     horizon = request.args.get('horizon', 60, type=int)
-    result = forecaster.predict(node_id, horizon)
+    samples = request.args.get('samples', 0, type=int)
+    try:
+        result = forecaster.predict(node_id, horizon, samples=samples)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     return jsonify(result)
 
 @app.route('/train', methods=['POST'])
@@ -1,18 +1,29 @@
 import numpy as np
 import joblib
 import os
+import threading
 from datetime import datetime
+from sklearn.base import clone
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler
 
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import MOHALI_CONFIG, get_baseline, get_time_slot
+from inference.quantile_sketch import ZoneScoreSketches
 
 class AnomalyDetector:
-    def __init__(self):
+    def __init__(self, score_percentile=None, min_sketch_count=500):
         self.model = None
         self.scaler = None
+        # Guards swapping the model/scaler pair while the batcher thread scores
+        self._model_lock = threading.Lock()
+        # When set, the model flags readings whose raw score sits at or above
+        # this live percentile of their zone instead of the fitted threshold
+        self.score_percentile = None
+        self.set_score_percentile(score_percentile)
+        self.min_sketch_count = min_sketch_count
+        self.score_sketches = ZoneScoreSketches()
         self.models_dir = os.path.join(os.path.dirname(__file__), '..', 'models')
         self.model_path = os.path.join(self.models_dir, 'anomaly_model.pkl')
         self.scaler_path = os.path.join(self.models_dir, 'anomaly_scaler.pkl')
@@ -33,12 +44,95 @@ class AnomalyDetector:
             self.scaler = StandardScaler()
     
     def detect(self, reading):
-        node_id = reading.get('node_id')
-        noise = float(reading.get('noise', 0))
-        temperature = float(reading.get('temperature', 0))
-        air_quality = int(reading.get('air_quality', 0))
-        crowd_density = int(reading.get('crowd_density', 0))
-        stress_index = int(reading.get('stress_index', 0))
+        result = self.detect_batch([reading])[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+    
+    def detect_batch(self, readings):
+        """Score a list of readings with a single model call.
+
+        Returns one entry per reading: its result dict, or the exception it
+        raised, so a malformed reading never fails the rest of the batch.
+        """
+        results = [None] * len(readings)
+        parsed = {}
+        for i, reading in enumerate(readings):
+            try:
+                parsed[i] = self._parse_reading(reading)
+            except (TypeError, ValueError) as e:
+                results[i] = ValueError(f"Invalid reading: {e}")
+        
+        ml_results = {i: (False, 0.5, None) for i in parsed}
+        
+        with self._model_lock:
+            model, scaler = self.model, self.scaler
+        
+        if parsed and model is not None and scaler is not None:
+            try:
+                X = np.array([
+                    [r['noise'], r['temperature'], r['air_quality'], r['crowd_density']]
+                    for r in parsed.values()
+                ])
+                X_scaled = scaler.transform(X)
+                # predict() is decision_function() < 0, so one pass covers both
+                scores = -model.decision_function(X_scaled)
+                ml_results = {i: self._score(r, float(score)) for (i, r), score in zip(parsed.items(), scores)}
+            except Exception:
+                pass
+        
+        for i, reading in parsed.items():
+            try:
+                results[i] = self._evaluate(reading, *ml_results[i])
+            except Exception as e:
+                results[i] = e
+        
+        return results
+    
+    def _parse_reading(self, reading):
+        if not isinstance(reading, dict):
+            raise TypeError(f"expected a JSON object, got {type(reading).__name__}")
+        return {
+            'node_id': reading.get('node_id'),
+            'noise': float(reading.get('noise', 0)),
+            'temperature': float(reading.get('temperature', 0)),
+            'air_quality': int(reading.get('air_quality', 0)),
+            'crowd_density': int(reading.get('crowd_density', 0)),
+            'stress_index': int(reading.get('stress_index', 0))
+        }
+    
+    def _score(self, reading, score):
+        zone = MOHALI_CONFIG['nodes'].get(reading.get('node_id'), {'zone': 'mixed'})['zone']
+        rank = self.score_sketches.rank(zone, score, self.min_sketch_count)
+        self.score_sketches.update(zone, score)
+        
+        percentile = round(rank * 100, 1) if rank is not None else None
+        if self.score_percentile is not None and rank is not None:
+            # The live rank is the ML component, matching how the flag was made
+            return rank * 100 >= self.score_percentile, rank, percentile
+        return score > 0, min(max(score, 0), 1), percentile
+    
+    def set_score_percentile(self, value):
+        """Flag by live zone score percentile in (0, 100), or None for the fitted threshold."""
+        if value is not None:
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 < value < 100:
+                raise ValueError("flag_percentile must be null or a number between 0 and 100")
+            value = float(value)
+        self.score_percentile = value
+    
+    def reset_score_sketches(self):
+        self.score_sketches = ZoneScoreSketches()
+    
+    def score_percentiles(self):
+        return self.score_sketches.percentiles()
+    
+    def _evaluate(self, reading, ml_anomaly, ml_score, score_percentile=None):
+        node_id = reading['node_id']
+        noise = reading['noise']
+        temperature = reading['temperature']
+        air_quality = reading['air_quality']
+        crowd_density = reading['crowd_density']
+        stress_index = reading['stress_index']
         
         now = datetime.now()
         baseline = get_baseline(node_id, now.hour, now.month)
@@ -54,21 +148,6 @@ class AnomalyDetector:
         aqi_dev = air_quality - baseline['aqi']
         crowd_dev = crowd_density - baseline['crowd']
         
-        # Use trained model if available
-        ml_anomaly = False
-        ml_score = 0.5
-        
-        if self.model is not None and self.scaler is not None:
-            try:
-                X = np.array([[noise, temperature, air_quality, crowd_density]])
-                X_scaled = self.scaler.transform(X)
-                prediction = self.model.predict(X_scaled)[0]
-                score = -self.model.decision_function(X_scaled)[0]
-                ml_anomaly = prediction == -1
-                ml_score = min(max(score, 0), 1)
-            except Exception:
-                pass
-        
         # Threshold-based signal detection
         if noise > thresholds['noise_critical'] or noise_dev > 15:
             signals.append('noise')
@@ -103,7 +182,8 @@ class AnomalyDetector:
             'deviations': deviations,
             'baseline': baseline,
             'time_context': time_slot,
-            'stress_index': stress_index
+            'stress_index': stress_index,
+            'score_percentile': score_percentile
         }
     
     def _generate_explanation(self, signals, deviations, time_slot, node_id, stress_index):
@@ -142,10 +222,19 @@ class AnomalyDetector:
             data = self._generate_training_data()
         
         X = np.array([[d['noise'], d['temp'], d['aqi'], d['crowd']] for d in data])
-        self.model.fit(X)
+        
+        # Fit a fresh pair off to the side; detections keep using the old one
+        scaler = StandardScaler()
+        model = clone(self.model).fit(scaler.fit_transform(X))
+        
+        with self._model_lock:
+            self.model, self.scaler = model, scaler
+        # Old-model scores would skew percentiles for the new one
+        self.reset_score_sketches()
         
         os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
-        joblib.dump(self.model, self.model_path)
+        joblib.dump(model, self.model_path)
+        joblib.dump(scaler, self.scaler_path)
         return True
     
     def _generate_training_data(self):
@@ -0,0 +1,94 @@
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+
+
+class DetectionBatcher:
+    """Coalesces concurrent single-reading /detect calls into batched model calls.
+
+    Requests are queued and flushed to ``detect_fn`` as one list once
+    ``max_batch_size`` readings are waiting or the oldest has waited
+    ``max_wait_ms``. Each caller gets back its own result via a Future;
+    ``detect_fn`` may return an exception for a single reading, which is
+    raised only to that caller.
+
+    Readings only coalesce if that many requests can be in flight at once,
+    so ``max_batch_size`` should not exceed the server's request threads.
+    """
+
+    def __init__(self, detect_fn, max_batch_size=32, max_wait_ms=5):
+        self.detect_fn = detect_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self._queue = queue.Queue()
+        self._worker = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._batch_sizes = Counter()
+
+    def submit(self, reading):
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((reading, future))
+        return future
+
+    def detect(self, reading, timeout=None):
+        return self.submit(reading).result(timeout=timeout)
+
+    def stats(self):
+        with self._stats_lock:
+            sizes = dict(sorted(self._batch_sizes.items()))
+        batches = sum(sizes.values())
+        requests = sum(size * count for size, count in sizes.items())
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000.0,
+            'batches': batches,
+            'requests': requests,
+            'mean_batch_size': round(requests / batches, 2) if batches else 0.0,
+            'largest_batch': max(sizes) if sizes else 0,
+            'batch_size_histogram': sizes,
+            'queued': self._queue.qsize()
+        }
+
+    def _ensure_worker(self):
+        # Started lazily so gunicorn workers each own their own thread
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._start_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='detect-batcher', daemon=True)
+                self._worker.start()
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            readings = [reading for reading, _ in batch]
+            try:
+                results = self.detect_fn(readings)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                # detect_fn reports per-reading failures in place of results
+                for (_, future), result in zip(batch, results):
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+
+            with self._stats_lock:
+                self._batch_sizes[len(batch)] += 1
@@ -6,12 +6,32 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import MOHALI_CONFIG, get_baseline, get_time_slot
 
+METRICS = ['noise', 'temp', 'aqi', 'crowd']
+# Relative jitter applied per metric on top of the shared variance scale
+METRIC_JITTER = np.array([1.0, 0.5, 1.2, 1.0])
+METRIC_LOWER = np.array([30, 10, 20, 0])
+METRIC_UPPER = np.array([95, 45, 200, 35])
+PERCENTILES = [10, 50, 90]
+# Log-space std of the forecast error added every step; it accumulates as a
+# random walk, so a 24h horizon spreads ~10x wider than one 15-minute step
+STEP_SIGMA = 0.012 * METRIC_JITTER
+# p10-p90 stress spread at which confidence reaches zero
+STRESS_BAND_SCALE = 50
+MAX_SAMPLES = 5000
+MAX_SAMPLE_HORIZON_MINUTES = 1440
+
 class Forecaster:
     def __init__(self):
         self.model = None
         self.smoothing_factor = 0.3
+        self.step_minutes = 15
     
-    def predict(self, node_id, horizon_minutes=60):
+    def predict(self, node_id, horizon_minutes=60, samples=None):
+        if samples is not None and samples < 0:
+            raise ValueError(f"samples must be between 1 and {MAX_SAMPLES}")
+        if samples:
+            return self.predict_intervals(node_id, horizon_minutes, samples)
+        
         now = datetime.now()
         forecasts = []
         
@@ -21,7 +41,7 @@ class Forecaster:
             node_forecasts = []
             prev_values = None
             
-            for i in range(0, horizon_minutes + 1, 15):
+            for i in range(0, horizon_minutes + 1, self.step_minutes):
                 future_time = now + timedelta(minutes=i)
                 baseline = get_baseline(nid, future_time.hour, future_time.month)
                 
@@ -85,6 +105,93 @@ class Forecaster:
         
         return forecasts if len(forecasts) > 1 else forecasts[0]
     
+    def predict_intervals(self, node_id, horizon_minutes=60, samples=1000, seed=None):
+        """Monte Carlo forecast returning p10/p50/p90 bands per metric and stress.
+
+        Every path follows the smoothed baseline scaled by its own
+        accumulated log-space error, simulated for all nodes at once as a
+        (nodes, paths, steps, metrics) array.
+        """
+        if not 0 < samples <= MAX_SAMPLES:
+            raise ValueError(f"samples must be between 1 and {MAX_SAMPLES}")
+        if not 0 <= horizon_minutes <= MAX_SAMPLE_HORIZON_MINUTES:
+            raise ValueError(f"horizon must be between 0 and {MAX_SAMPLE_HORIZON_MINUTES} minutes when sampling")
+        
+        now = datetime.now()
+        rng = np.random.default_rng(seed)
+        
+        nodes = [node_id] if node_id else list(MOHALI_CONFIG['nodes'].keys())
+        offsets = list(range(0, horizon_minutes + 1, self.step_minutes))
+        times = [now + timedelta(minutes=i) for i in offsets]
+        
+        baselines = np.array([
+            [[get_baseline(nid, t.hour, t.month)[m] for m in METRICS] for t in times]
+            for nid in nodes
+        ], dtype=float)
+        
+        # Deterministic smoothed level, same recursion as predict()
+        levels = np.empty_like(baselines)
+        levels[:, 0] = baselines[:, 0]
+        a = self.smoothing_factor
+        for step in range(1, len(offsets)):
+            levels[:, step] = a * baselines[:, step] + (1 - a) * levels[:, step - 1]
+        
+        errors = self._accumulated_errors((len(nodes), samples, len(offsets)), rng)
+        paths = np.clip(levels[:, None] * errors, METRIC_LOWER, METRIC_UPPER)
+        
+        stress = self._stress_index(paths)
+        metric_bands = np.percentile(paths, PERCENTILES, axis=1)
+        stress_bands = np.percentile(stress, PERCENTILES, axis=1)
+        # Narrower stress bands mean higher confidence
+        confidence = np.clip(1 - (stress_bands[2] - stress_bands[0]) / STRESS_BAND_SCALE, 0, 1)
+        
+        forecasts = []
+        for n, nid in enumerate(nodes):
+            node_forecasts = []
+            for step, i in enumerate(offsets):
+                bands = {
+                    m: {f'p{p}': round(float(metric_bands[k, n, step, j]), 1) for k, p in enumerate(PERCENTILES)}
+                    for j, m in enumerate(METRICS)
+                }
+                bands['stress'] = {f'p{p}': round(float(stress_bands[k, n, step])) for k, p in enumerate(PERCENTILES)}
+                
+                node_forecasts.append({
+                    'timestamp': times[step].isoformat(),
+                    'minutes_ahead': i,
+                    'predicted_stress': bands['stress']['p50'],
+                    'predicted_noise': bands['noise']['p50'],
+                    'predicted_temp': bands['temp']['p50'],
+                    'predicted_aqi': round(bands['aqi']['p50']),
+                    'predicted_crowd': round(bands['crowd']['p50']),
+                    'confidence': round(float(confidence[n, step]), 2),
+                    'intervals': bands
+                })
+            
+            forecasts.append({
+                'node_id': nid,
+                'node_name': MOHALI_CONFIG['nodes'].get(nid, {}).get('name', 'Unknown'),
+                'forecast': node_forecasts,
+                'trend': self._calculate_trend(node_forecasts),
+                'samples': samples
+            })
+        
+        return forecasts if len(forecasts) > 1 else forecasts[0]
+    
+    def _accumulated_errors(self, shape, rng):
+        """Multiplicative errors of shape (..., steps, metrics) from a log-space random walk."""
+        shocks = rng.standard_normal((*shape, len(METRICS))) * STEP_SIGMA
+        # Step 0 is "now" and carries no forecast error
+        shocks[..., 0, :] = 0
+        return np.exp(np.cumsum(shocks, axis=-2))
+    
+    def _stress_index(self, values):
+        noise, temp, aqi, crowd = np.moveaxis(values, -1, 0)
+        n_score = np.minimum((noise - 40) / 60 * 100, 100)
+        t_score = np.minimum((temp - 15) / 25 * 100, 100)
+        a_score = np.minimum(aqi / 150 * 100, 100)
+        d_score = np.minimum(crowd / 30 * 100, 100)
+        return np.maximum(0, (n_score * 0.4) + (t_score * 0.25) + (a_score * 0.2) + (d_score * 0.15))
+    
     def _calculate_trend(self, forecasts):
         if len(forecasts) < 2:
             return 'stable'
@@ -0,0 +1,124 @@
+import math
+import random
+import threading
+
+
+class KLLSketch:
+    """Streaming quantile sketch (Karnin-Lang-Liberty) with bounded memory.
+
+    Items enter level 0; when the sketch is full, the lowest over-capacity
+    level is sorted and every other item is promoted to the next level with
+    double the weight. Memory stays around ``k / (1 - c)`` items regardless
+    of how many values are seen.
+    """
+
+    def __init__(self, k=200, c=2 / 3, seed=None):
+        self.k = k
+        self.c = c
+        self.count = 0
+        self.compactors = [[]]
+        self._size = 0
+        self._max_size = 0
+        self._rng = random.Random(seed)
+        self._update_max_size()
+
+    def _capacity(self, level):
+        depth = len(self.compactors) - level - 1
+        return max(2, int(math.ceil(self.k * self.c ** depth)))
+
+    def _update_max_size(self):
+        self._max_size = sum(self._capacity(h) for h in range(len(self.compactors)))
+
+    def update(self, value):
+        self.compactors[0].append(float(value))
+        self.count += 1
+        self._size += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def _compress(self):
+        for h in range(len(self.compactors)):
+            if len(self.compactors[h]) < self._capacity(h):
+                continue
+            if h + 1 >= len(self.compactors):
+                self.compactors.append([])
+                self._update_max_size()
+
+            items = sorted(self.compactors[h])
+            # An odd item out stays behind so weights remain exact
+            keep = [items.pop()] if len(items) % 2 else []
+            promoted = items[self._rng.randint(0, 1)::2]
+
+            self.compactors[h] = keep
+            self.compactors[h + 1].extend(promoted)
+            self._size -= len(items) - len(promoted)
+            if self._size < self._max_size:
+                break
+
+    def _weighted_items(self):
+        items = [(value, 2 ** h) for h, compactor in enumerate(self.compactors) for value in compactor]
+        items.sort()
+        return items
+
+    def rank(self, value):
+        """Approximate fraction of seen values below ``value`` (mid-rank for ties)."""
+        items = self._weighted_items()
+        total = sum(weight for _, weight in items)
+        if not total:
+            return 0.0
+        below = sum(weight for v, weight in items if v < value)
+        # Ties count half so a plateau of equal scores is not all ranked top
+        tied = sum(weight for v, weight in items if v == value)
+        return (below + tied / 2) / total
+
+    def quantiles(self, qs):
+        items = self._weighted_items()
+        if not items:
+            return [None] * len(qs)
+        total = sum(weight for _, weight in items)
+
+        results = []
+        for q in qs:
+            target = q * total
+            cumulative = 0
+            for value, weight in items:
+                cumulative += weight
+                if cumulative >= target:
+                    break
+            results.append(value)
+        return results
+
+
+class ZoneScoreSketches:
+    """Thread-safe KLL sketch per zone, fed by every detection."""
+
+    def __init__(self, k=200):
+        self.k = k
+        self._sketches = {}
+        self._lock = threading.Lock()
+
+    def update(self, zone, score):
+        with self._lock:
+            sketch = self._sketches.get(zone)
+            if sketch is None:
+                sketch = self._sketches[zone] = KLLSketch(k=self.k)
+            sketch.update(score)
+
+    def rank(self, zone, score, min_count=0):
+        with self._lock:
+            sketch = self._sketches.get(zone)
+            if sketch is None or sketch.count < max(min_count, 1):
+                return None
+            return sketch.rank(score)
+
+    def percentiles(self, percentiles=(50, 90, 95, 99)):
+        with self._lock:
+            summary = {}
+            for zone, sketch in sorted(self._sketches.items()):
+                values = sketch.quantiles([p / 100 for p in percentiles])
+                summary[zone] = {
+                    'count': sketch.count,
+                    'retained': sum(len(c) for c in sketch.compactors),
+                    'percentiles': {f'p{p}': round(v, 4) for p, v in zip(percentiles, values)}
+                }
+            return summary
@@ -0,0 +1,78 @@
+# Memory-lean column layout shared by the generator, loaders and trainer.
+# A year of 5-minute readings across 100 nodes is ~10.5M rows, so every
+# byte per row matters.
+
+import os
+import numpy as np
+import pandas as pd
+
+TIMEZONE = 'Asia/Kolkata'
+
+SENSOR_DTYPES = {
+    'timestamp': 'int64',        # epoch seconds (UTC)
+    'node_id': 'category',
+    'node_name': 'category',
+    'zone_type': 'category',
+    'noise': 'float32',
+    'temperature': 'float32',
+    'air_quality': 'uint16',     # generator caps AQI at 400
+    'crowd_density': 'uint8',    # generator caps crowd at 50
+    'stress_index': 'uint8',     # 0-100
+    'is_injected': 'bool',
+}
+
+SMALL_INT_COLUMNS = ['air_quality', 'crowd_density', 'stress_index']
+
+def apply_schema(df):
+    """Cast known columns to the compact layout, leaving others untouched."""
+    if 'timestamp' in df and not pd.api.types.is_integer_dtype(df['timestamp']):
+        df['timestamp'] = to_epoch(df['timestamp'])
+    for col in SMALL_INT_COLUMNS:
+        # Legacy data stored injected anomalies as floats in integer columns
+        if col in df and pd.api.types.is_float_dtype(df[col]):
+            limits = np.iinfo(SENSOR_DTYPES[col])
+            df[col] = df[col].round().clip(limits.min, limits.max)
+    return df.astype({col: dtype for col, dtype in SENSOR_DTYPES.items() if col in df})
+
+def to_epoch(values):
+    ts = pd.to_datetime(values)
+    if ts.dt.tz is None:
+        ts = ts.dt.tz_localize(TIMEZONE)
+    return ts.dt.tz_convert('UTC').dt.tz_localize(None).astype('datetime64[s]').astype('int64')
+
+def to_local_datetime(epoch_seconds):
+    return pd.to_datetime(epoch_seconds, unit='s', utc=True).dt.tz_convert(TIMEZONE)
+
+def save_dataset(df, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if path.endswith('.parquet'):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+def load_dataset(path):
+    if path.endswith('.parquet'):
+        df = pd.read_parquet(path)
+    else:
+        # Timestamps may be legacy ISO strings and integer columns legacy
+        # floats, so both are read as-is and converted by apply_schema
+        dtypes = {col: dtype for col, dtype in SENSOR_DTYPES.items()
+                  if col != 'timestamp' and col not in SMALL_INT_COLUMNS}
+        df = pd.read_csv(path, dtype=dtypes)
+    return apply_schema(df)
+
+def memory_mb(df):
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+def legacy_layout(df):
+    """The pre-schema representation: ISO strings, objects and 64-bit numbers."""
+    legacy = df.copy()
+    legacy['timestamp'] = to_local_datetime(df['timestamp']).dt.tz_localize(None).map(pd.Timestamp.isoformat)
+    for col in ['node_id', 'node_name', 'zone_type']:
+        legacy[col] = legacy[col].astype(object)
+    for col in ['noise', 'temperature']:
+        legacy[col] = legacy[col].astype(np.float64)
+    for col in ['air_quality', 'crowd_density', 'stress_index']:
+        if col in legacy:
+            legacy[col] = legacy[col].astype(np.int64)
+    return legacy
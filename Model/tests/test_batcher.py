@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from inference.batcher import DetectionBatcher
+from inference.anomaly_detector import AnomalyDetector
+
+
+def echo_batch(readings):
+    return [{'id': r['id'], 'batch_size': len(readings)} for r in readings]
+
+
+def test_flushes_when_batch_is_full():
+    # A long wait means only the size trigger can flush quickly
+    batcher = DetectionBatcher(echo_batch, max_batch_size=4, max_wait_ms=5000)
+    start = time.monotonic()
+    futures = [batcher.submit({'id': i}) for i in range(4)]
+    results = [f.result(timeout=2) for f in futures]
+
+    assert time.monotonic() - start < 2
+    assert batcher.stats()['batch_size_histogram'] == {4: 1}
+    assert [r['batch_size'] for r in results] == [4, 4, 4, 4]
+
+
+def test_flushes_partial_batch_after_wait():
+    batcher = DetectionBatcher(echo_batch, max_batch_size=100, max_wait_ms=20)
+    futures = [batcher.submit({'id': i}) for i in range(3)]
+    results = [f.result(timeout=2) for f in futures]
+
+    stats = batcher.stats()
+    assert stats['batch_size_histogram'] == {3: 1}
+    assert stats['requests'] == 3
+    assert [r['batch_size'] for r in results] == [3, 3, 3]
+
+
+def test_each_caller_gets_its_own_result():
+    batcher = DetectionBatcher(echo_batch, max_batch_size=8, max_wait_ms=20)
+    futures = [batcher.submit({'id': i}) for i in range(20)]
+    assert [f.result(timeout=2)['id'] for f in futures] == list(range(20))
+
+
+def test_bad_reading_fails_only_its_own_future():
+    detector = AnomalyDetector()
+    batcher = DetectionBatcher(detector.detect_batch, max_batch_size=5, max_wait_ms=1000)
+    good = {'node_id': 'CP-MOH-01', 'noise': 60, 'temperature': 28,
+            'air_quality': 90, 'crowd_density': 10, 'stress_index': 40}
+    readings = [good, dict(good, noise='loud'), good, None, good]
+    futures = [batcher.submit(r) for r in readings]
+
+    for i in (1, 3):
+        with pytest.raises(ValueError):
+            futures[i].result(timeout=2)
+    for i in (0, 2, 4):
+        assert 'is_anomaly' in futures[i].result(timeout=2)
+    assert batcher.stats()['batch_size_histogram'] == {5: 1}
@@ -0,0 +1,53 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from inference.forecaster import Forecaster, MAX_SAMPLES
+
+
+@pytest.fixture(scope='module')
+def day_forecast():
+    return Forecaster().predict_intervals('CP-MOH-01', 1440, samples=1000, seed=7)
+
+
+def test_uncertainty_grows_with_horizon():
+    errors = Forecaster()._accumulated_errors((5000, 97), np.random.default_rng(7))
+    p10, p90 = np.percentile(errors, [10, 90], axis=0)
+    # Relative p10-p90 spread at 3-hour checkpoints across a 24h horizon
+    spread = (p90 / p10)[1::12]
+    assert np.all(np.diff(spread, axis=0) > 0)
+
+
+def test_bands_widen_from_first_to_last_step(day_forecast):
+    first, last = day_forecast['forecast'][0], day_forecast['forecast'][-1]
+    for metric in ['noise', 'temp', 'aqi', 'crowd']:
+        width = lambda p: (p['intervals'][metric]['p90'] - p['intervals'][metric]['p10']) / p['intervals'][metric]['p50']
+        assert width(last) > width(first), metric
+
+
+def test_no_band_at_step_zero(day_forecast):
+    now = day_forecast['forecast'][0]
+    for band in now['intervals'].values():
+        assert band['p10'] == band['p50'] == band['p90']
+    assert now['confidence'] == 1.0
+
+
+def test_bands_are_ordered(day_forecast):
+    for point in day_forecast['forecast']:
+        for band in point['intervals'].values():
+            assert band['p10'] <= band['p50'] <= band['p90']
+
+
+def test_confidence_tracks_band_width(day_forecast):
+    points = day_forecast['forecast']
+    assert points[-1]['confidence'] < points[0]['confidence']
+    assert len({p['confidence'] for p in points}) > 1
+
+
+@pytest.mark.parametrize('samples', [-1, MAX_SAMPLES + 1])
+def test_rejects_out_of_range_samples(samples):
+    with pytest.raises(ValueError):
+        Forecaster().predict('CP-MOH-01', 60, samples=samples)
@@ -0,0 +1,101 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from inference.quantile_sketch import KLLSketch, ZoneScoreSketches
+from inference.anomaly_detector import AnomalyDetector
+
+N = 500_000
+
+
+def streams():
+    rng = np.random.default_rng(3)
+    return {
+        'lognormal': rng.lognormal(size=N),
+        'uniform': rng.uniform(size=N),
+        'sorted': np.sort(rng.normal(size=N)),
+    }
+
+
+@pytest.mark.parametrize('name', ['lognormal', 'uniform', 'sorted'])
+def test_rank_error_and_memory_are_bounded(name):
+    values = streams()[name]
+    sketch = KLLSketch(k=200, seed=1)
+    for v in values:
+        sketch.update(v)
+
+    assert sketch.count == N
+    assert sum(len(c) for c in sketch.compactors) <= 650
+
+    sorted_values = np.sort(values)
+    for q in [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99]:
+        exact = sorted_values[int(q * N)]
+        assert abs(sketch.rank(exact) - q) <= 0.01, q
+        estimate = sketch.quantiles([q])[0]
+        assert abs(np.searchsorted(sorted_values, estimate) / N - q) <= 0.01, q
+
+
+def test_small_stream_is_exact():
+    sketch = KLLSketch()
+    for v in range(100):
+        sketch.update(v)
+    assert sketch.quantiles([0.5, 0.9]) == [49.0, 89.0]
+    assert sketch.rank(49.5) == 0.5
+
+
+def test_ties_use_mid_rank():
+    sketch = KLLSketch()
+    for _ in range(10):
+        sketch.update(1.0)
+    assert sketch.rank(1.0) == 0.5
+
+
+def test_empty_sketch():
+    sketch = KLLSketch()
+    assert sketch.rank(1.0) == 0.0
+    assert sketch.quantiles([0.5]) == [None]
+
+
+def test_zone_rank_waits_for_warm_up():
+    sketches = ZoneScoreSketches()
+    for v in range(9):
+        sketches.update('commercial', v)
+    assert sketches.rank('commercial', 5, min_count=10) is None
+    assert sketches.rank('residential', 5) is None
+
+    sketches.update('commercial', 9)
+    assert sketches.rank('commercial', 5, min_count=10) == pytest.approx(0.55)
+    assert set(sketches.percentiles()) == {'commercial'}
+
+
+@pytest.mark.parametrize('value', ['99', True, 0, 100, 150, -5])
+def test_set_score_percentile_rejects_invalid(value):
+    detector = AnomalyDetector()
+    with pytest.raises(ValueError):
+        detector.set_score_percentile(value)
+
+
+@pytest.mark.parametrize('value', [None, 0.5, 95, 99.9])
+def test_set_score_percentile_accepts_valid(value):
+    detector = AnomalyDetector()
+    detector.set_score_percentile(value)
+    assert detector.score_percentile == value
+
+
+def test_reset_clears_score_history():
+    detector = AnomalyDetector()
+    detector.score_sketches.update('mixed', 0.1)
+    detector.reset_score_sketches()
+    assert detector.score_percentiles() == {}
+
+
+def test_training_resets_score_history(tmp_path):
+    detector = AnomalyDetector()
+    detector.model_path = str(tmp_path / 'anomaly_model.pkl')
+    detector.scaler_path = str(tmp_path / 'anomaly_scaler.pkl')
+    detector.score_sketches.update('mixed', 0.1)
+    detector.train()
+    assert detector.score_percentiles() == {}
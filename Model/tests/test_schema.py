@@ -0,0 +1,56 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'training'))
+from schema import SENSOR_DTYPES, load_dataset, save_dataset
+from data_generator import generate_mohali_dataset, inject_anomalies
+
+
+def assert_schema(df):
+    for col, dtype in SENSOR_DTYPES.items():
+        if col in df:
+            assert str(df[col].dtype) == dtype, col
+
+
+def test_generated_data_uses_schema():
+    df = inject_anomalies(generate_mohali_dataset(days=1))
+    assert set(df.columns) == set(SENSOR_DTYPES) - {'stress_index'}
+    assert_schema(df)
+
+
+def test_round_trip_keeps_schema(tmp_path):
+    df = inject_anomalies(generate_mohali_dataset(days=1))
+    for name in ['data.parquet', 'data.csv']:
+        path = str(tmp_path / name)
+        save_dataset(df, path)
+        loaded = load_dataset(path)
+        assert_schema(loaded)
+        assert (loaded['timestamp'].to_numpy() == df['timestamp'].to_numpy()).all()
+        assert (loaded['air_quality'].to_numpy() == df['air_quality'].to_numpy()).all()
+
+
+def test_loads_legacy_csv(tmp_path):
+    # What the original trainer wrote: ISO timestamps and, after anomaly
+    # injection, float values in the integer columns
+    legacy = pd.DataFrame({
+        'timestamp': ['2025-01-15T08:00:00.123456', '2025-01-15T08:05:00.123456'],
+        'node_id': ['CP-MOH-01', 'CP-MOH-02'],
+        'node_name': ['IT Park Sector 70', 'Phase 11'],
+        'zone_type': ['commercial', 'residential'],
+        'noise': [61.2, 48.0],
+        'temperature': [18.4, 17.9],
+        'air_quality': [112.0, 213.7],
+        'crowd_density': [9.0, 27.6],
+    })
+    path = str(tmp_path / 'mohali_sensor_data.csv')
+    legacy.to_csv(path, index=False)
+
+    df = load_dataset(path)
+    assert_schema(df)
+    assert df['air_quality'].tolist() == [112, 214]
+    assert df['crowd_density'].tolist() == [9, 28]
+    # Naive legacy times are Mohali local time (UTC+5:30)
+    assert df['timestamp'].iloc[0] == int(pd.Timestamp('2025-01-15T02:30:00', tz='UTC').timestamp())
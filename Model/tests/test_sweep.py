@@ -0,0 +1,53 @@
+import json
+import os
+import sys
+from itertools import product
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'training'))
+from sweep_anomaly_model import select_model, build_configs, PARAM_GRID
+from train_anomaly_model import load_sweep_params
+
+
+def result(name, f1, model_bytes, latency_ms):
+    return {'params': {'name': name}, 'f1': f1, 'model_bytes': model_bytes, 'latency_ms_single': latency_ms}
+
+
+def test_selects_smallest_then_fastest_passing_model():
+    results = [
+        result('accurate-but-large', 0.9, 5000, 1.0),
+        result('small-slow', 0.6, 1000, 9.0),
+        result('small-fast', 0.6, 1000, 2.0),
+        result('tiny-inaccurate', 0.1, 100, 0.5),
+    ]
+    assert select_model(results, min_f1=0.5)['params']['name'] == 'small-fast'
+
+
+def test_accuracy_bar_is_inclusive():
+    assert select_model([result('edge', 0.5, 10, 1.0)], min_f1=0.5)['params']['name'] == 'edge'
+
+
+def test_returns_none_when_nothing_passes():
+    assert select_model([result('weak', 0.2, 10, 1.0)], min_f1=0.5) is None
+    assert select_model([], min_f1=0.5) is None
+
+
+def test_random_configs_are_a_subset_of_the_grid():
+    grid = build_configs()
+    assert len(grid) == len(list(product(*PARAM_GRID.values())))
+    sampled = build_configs(n_random=5)
+    assert len(sampled) == 5 and all(c in grid for c in sampled)
+
+
+def test_load_sweep_params(tmp_path):
+    path = tmp_path / 'sweep_results.json'
+    path.write_text(json.dumps({'selected': {'params': {'n_estimators': 25}}, 'results': []}))
+    assert load_sweep_params(str(path)) == {'n_estimators': 25}
+
+
+def test_load_sweep_params_raises_without_selection(tmp_path):
+    path = tmp_path / 'sweep_results.json'
+    path.write_text(json.dumps({'min_f1': 0.9, 'selected': None, 'results': []}))
+    with pytest.raises(ValueError):
+        load_sweep_params(str(path))
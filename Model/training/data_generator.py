@@ -1,9 +1,12 @@
 import pandas as pd
 import numpy as np
 import os
-from datetime import datetime, timedelta
+import sys
 import json
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from schema import TIMEZONE, apply_schema, save_dataset, memory_mb
+
 # Data sources for Mohali/Chandigarh region
 DATA_SOURCES = {
     'cpcb_aq': {
@@ -74,81 +77,69 @@ def get_season(month):
     else:
         return 'winter'
 
-def generate_mohali_dataset(days=30, interval_minutes=5):
+NODES = [
+    {'id': 'CP-MOH-01', 'name': 'IT Park Sector 70', 'zone': 'commercial', 
+     'base_noise': 58, 'base_temp': 28, 'base_aqi': 85, 'base_crowd': 12},
+    {'id': 'CP-MOH-02', 'name': 'Phase 11', 'zone': 'residential',
+     'base_noise': 48, 'base_temp': 27, 'base_aqi': 75, 'base_crowd': 6},
+    {'id': 'CP-MOH-03', 'name': 'Phase 7', 'zone': 'mixed',
+     'base_noise': 52, 'base_temp': 27.5, 'base_aqi': 80, 'base_crowd': 10},
+    {'id': 'CP-MOH-04', 'name': 'Sector 77', 'zone': 'residential',
+     'base_noise': 45, 'base_temp': 26.5, 'base_aqi': 72, 'base_crowd': 5},
+    {'id': 'CP-MOH-05', 'name': 'Phase 3B2', 'zone': 'commercial',
+     'base_noise': 60, 'base_temp': 28.5, 'base_aqi': 88, 'base_crowd': 15}
+]
+
+def synthetic_nodes(count):
+    """Scale the Mohali node set up to `count` nodes by cycling its profiles"""
+    nodes = []
+    for i in range(count):
+        template = NODES[i % len(NODES)]
+        nodes.append(dict(template, id=f"CP-MOH-{i + 1:03d}", name=f"{template['name']} #{i // len(NODES) + 1}"))
+    return nodes
+
+def generate_mohali_dataset(days=30, interval_minutes=5, nodes=None):
     """Generate realistic Mohali sensor data based on regional patterns"""
     
-    nodes = [
-        {'id': 'CP-MOH-01', 'name': 'IT Park Sector 70', 'zone': 'commercial', 
-         'base_noise': 58, 'base_temp': 28, 'base_aqi': 85, 'base_crowd': 12},
-        {'id': 'CP-MOH-02', 'name': 'Phase 11', 'zone': 'residential',
-         'base_noise': 48, 'base_temp': 27, 'base_aqi': 75, 'base_crowd': 6},
-        {'id': 'CP-MOH-03', 'name': 'Phase 7', 'zone': 'mixed',
-         'base_noise': 52, 'base_temp': 27.5, 'base_aqi': 80, 'base_crowd': 10},
-        {'id': 'CP-MOH-04', 'name': 'Sector 77', 'zone': 'residential',
-         'base_noise': 45, 'base_temp': 26.5, 'base_aqi': 72, 'base_crowd': 5},
-        {'id': 'CP-MOH-05', 'name': 'Phase 3B2', 'zone': 'commercial',
-         'base_noise': 60, 'base_temp': 28.5, 'base_aqi': 88, 'base_crowd': 15}
-    ]
+    nodes = nodes or NODES
     
-    records = []
-    end_time = datetime.now()
-    start_time = end_time - timedelta(days=days)
-    current_time = start_time
+    end_time = pd.Timestamp.now(tz=TIMEZONE).floor('s')
+    times = pd.date_range(end=end_time, periods=days * 24 * 60 // interval_minutes + 1,
+                          freq=f'{interval_minutes}min')
+    hours = times.hour.to_numpy()
+    seasons = np.array([get_season(m) for m in range(1, 13)])[times.month.to_numpy() - 1]
     
-    while current_time <= end_time:
-        hour = current_time.hour
-        month = current_time.month
-        season = get_season(month)
-        
-        for node in nodes:
-            zone = node['zone']
-            
-            # Apply diurnal patterns
-            noise_mult = MOHALI_PATTERNS['diurnal']['noise'][hour]
-            temp_mult = MOHALI_PATTERNS['diurnal']['temp'][hour]
-            aqi_mult = MOHALI_PATTERNS['diurnal']['aqi'][hour]
-            crowd_mult = MOHALI_PATTERNS['diurnal']['crowd'][hour]
-            
-            # Apply seasonal adjustments
-            seasonal = MOHALI_PATTERNS['seasonal'][season]
-            noise_mult *= seasonal['noise']
-            temp_mult *= seasonal['temp']
-            aqi_mult *= seasonal['aqi']
-            crowd_mult *= seasonal['crowd']
-            
-            # Apply zone multipliers
-            zone_mult = MOHALI_PATTERNS['zone_multipliers'][zone]
-            noise_mult *= zone_mult['noise']
-            temp_mult *= zone_mult['temp']
-            aqi_mult *= zone_mult['aqi']
-            crowd_mult *= zone_mult['crowd']
-            
-            # Calculate values with realistic variance
-            noise = node['base_noise'] * noise_mult * (1 + np.random.normal(0, 0.08))
-            temp = node['base_temp'] * temp_mult * (1 + np.random.normal(0, 0.03))
-            aqi = node['base_aqi'] * aqi_mult * (1 + np.random.normal(0, 0.12))
-            crowd = max(0, node['base_crowd'] * crowd_mult * (1 + np.random.normal(0, 0.15)))
-            
-            # Clamp to realistic ranges
-            noise = np.clip(noise, 35, 100)
-            temp = np.clip(temp, 10, 45)
-            aqi = np.clip(aqi, 20, 300)
-            crowd = np.clip(crowd, 0, 40)
-            
-            records.append({
-                'timestamp': current_time.isoformat(),
-                'node_id': node['id'],
-                'node_name': node['name'],
-                'zone_type': zone,
-                'noise': round(noise, 1),
-                'temperature': round(temp, 1),
-                'air_quality': int(aqi),
-                'crowd_density': int(crowd)
-            })
+    # (time, node) grids, flattened time-major to match reading order
+    shape = (len(times), len(nodes))
+    columns = {}
+    for metric, col, sigma, low, high in [
+        ('noise', 'noise', 0.08, 35, 100),
+        ('temp', 'temperature', 0.03, 10, 45),
+        ('aqi', 'air_quality', 0.12, 20, 300),
+        ('crowd', 'crowd_density', 0.15, 0, 40),
+    ]:
+        # Apply diurnal, seasonal and zone multipliers
+        diurnal = np.array([MOHALI_PATTERNS['diurnal'][metric][h] for h in range(24)])[hours]
+        seasonal = np.array([MOHALI_PATTERNS['seasonal'][s][metric] for s in seasons])
+        zone = np.array([MOHALI_PATTERNS['zone_multipliers'][n['zone']][metric] for n in nodes])
+        base = np.array([n[f'base_{metric}'] for n in nodes])
         
-        current_time += timedelta(minutes=interval_minutes)
+        # Calculate values with realistic variance, clamped to realistic ranges
+        values = base * zone * (diurnal * seasonal)[:, None] * (1 + np.random.normal(0, sigma, shape))
+        columns[col] = np.clip(values, low, high).ravel()
     
-    return pd.DataFrame(records)
+    df = pd.DataFrame({
+        'timestamp': np.repeat(times.as_unit('s').asi8, len(nodes)),
+        'node_id': pd.Categorical(np.tile([n['id'] for n in nodes], len(times))),
+        'node_name': pd.Categorical(np.tile([n['name'] for n in nodes], len(times))),
+        'zone_type': pd.Categorical(np.tile([n['zone'] for n in nodes], len(times))),
+        'noise': columns['noise'].round(1),
+        'temperature': columns['temperature'].round(1),
+        'air_quality': columns['air_quality'],
+        'crowd_density': columns['crowd_density']
+    })
+    
+    return apply_schema(df)
 
 def inject_anomalies(df, anomaly_rate=0.02):
     """Inject realistic anomalies into the dataset"""
@@ -156,19 +147,22 @@ def inject_anomalies(df, anomaly_rate=0.02):
     n_anomalies = int(len(df) * anomaly_rate)
     anomaly_indices = np.random.choice(df.index, n_anomalies, replace=False)
     
-    anomaly_types = ['noise_spike', 'heat_wave', 'pollution_event', 'crowd_surge']
+    anomaly_types = np.array(['noise_spike', 'heat_wave', 'pollution_event', 'crowd_surge'])
+    chosen = np.random.choice(anomaly_types, n_anomalies)
     
-    for idx in anomaly_indices:
-        anomaly_type = np.random.choice(anomaly_types)
-        
-        if anomaly_type == 'noise_spike':
-            df.loc[idx, 'noise'] = min(100, df.loc[idx, 'noise'] * 1.5 + np.random.uniform(10, 20))
-        elif anomaly_type == 'heat_wave':
-            df.loc[idx, 'temperature'] = min(45, df.loc[idx, 'temperature'] * 1.2 + np.random.uniform(3, 6))
-        elif anomaly_type == 'pollution_event':
-            df.loc[idx, 'air_quality'] = min(400, df.loc[idx, 'air_quality'] * 1.8 + np.random.uniform(30, 60))
-        elif anomaly_type == 'crowd_surge':
-            df.loc[idx, 'crowd_density'] = min(50, df.loc[idx, 'crowd_density'] * 2 + np.random.uniform(5, 15))
+    # Ground truth labels for evaluating detectors
+    df['is_injected'] = False
+    df.loc[anomaly_indices, 'is_injected'] = True
+    
+    for anomaly_type, col, factor, low, high, cap in [
+        ('noise_spike', 'noise', 1.5, 10, 20, 100),
+        ('heat_wave', 'temperature', 1.2, 3, 6, 45),
+        ('pollution_event', 'air_quality', 1.8, 30, 60, 400),
+        ('crowd_surge', 'crowd_density', 2, 5, 15, 50),
+    ]:
+        idx = anomaly_indices[chosen == anomaly_type]
+        values = np.minimum(cap, df.loc[idx, col].to_numpy(dtype=float) * factor + np.random.uniform(low, high, len(idx)))
+        df.loc[idx, col] = values.astype(df[col].dtype)
     
     return df
 
@@ -183,13 +177,11 @@ if __name__ == '__main__':
     
     # Save to processed folder
     output_dir = os.path.join(os.path.dirname(__file__), '..', 'data', 'processed')
-    os.makedirs(output_dir, exist_ok=True)
-    
-    output_path = os.path.join(output_dir, 'mohali_sensor_data.csv')
-    df.to_csv(output_path, index=False)
+    output_path = os.path.join(output_dir, 'mohali_sensor_data.parquet')
+    save_dataset(df, output_path)
     
     print(f"Generated {len(df)} records")
-    print(f"Saved to {output_path}")
+    print(f"Saved to {output_path} ({memory_mb(df):.1f} MB in memory)")
     
     # Print summary statistics
     print("\nDataset Statistics:")
@@ -0,0 +1,38 @@
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from schema import memory_mb, legacy_layout
+from data_generator import generate_mohali_dataset, inject_anomalies, synthetic_nodes
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare pipeline memory before and after the compact schema')
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--nodes', type=int, default=100)
+    parser.add_argument('--interval', type=int, default=5, help='Minutes between readings')
+    parser.add_argument('--sample-days', type=int, default=7,
+                        help='Days used to measure the legacy layout, which is too large to build in full')
+    args = parser.parse_args()
+
+    nodes = synthetic_nodes(args.nodes)
+
+    print(f"Generating {args.days} days x {args.nodes} nodes at {args.interval}-minute intervals...")
+    start = time.perf_counter()
+    df = inject_anomalies(generate_mohali_dataset(args.days, args.interval, nodes))
+    elapsed = time.perf_counter() - start
+
+    sample = generate_mohali_dataset(args.sample_days, args.interval, nodes)
+    legacy_per_row = memory_mb(legacy_layout(sample)) / len(sample)
+    compact_mb = memory_mb(df)
+    legacy_mb = legacy_per_row * len(df)
+
+    print(f"Generated {len(df):,} records in {elapsed:.1f}s")
+    print("\nMemory (deep):")
+    print(f"  Legacy layout:  {legacy_mb:,.0f} MB (extrapolated from a {args.sample_days}-day sample)")
+    print(f"  Compact schema: {compact_mb:,.0f} MB")
+    print(f"  Reduction:      {legacy_mb / compact_mb:.1f}x")
+    print("\nPer-column bytes/row (compact):")
+    for col, nbytes in df.memory_usage(deep=True, index=False).items():
+        print(f"  {col:<14} {nbytes / len(df):.2f}")
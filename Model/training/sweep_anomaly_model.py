@@ -0,0 +1,149 @@
+import numpy as np
+import os
+import json
+import pickle
+import random
+import argparse
+import tempfile
+import time
+from itertools import product
+from concurrent.futures import ProcessPoolExecutor
+from sklearn.ensemble import IsolationForest
+from sklearn.metrics import precision_recall_fscore_support
+from sklearn.preprocessing import StandardScaler
+
+from train_anomaly_model import AnomalyModelTrainer, FIXED_MODEL_KWARGS
+
+PARAM_GRID = {
+    'n_estimators': [25, 50, 100, 200],
+    'max_samples': [64, 128, 256, 'auto'],
+    'contamination': [0.01, 0.02, 0.03],
+    'max_features': [0.5, 1.0],
+}
+
+# Batch size the ML service flushes to the model (DETECT_MAX_BATCH_SIZE)
+MICRO_BATCH_SIZE = int(os.environ.get('DETECT_MAX_BATCH_SIZE', 16))
+LATENCY_REPEATS = 50
+
+# Read-only views opened once per worker process
+_X = None
+_y = None
+
+def _init_worker(x_path, y_path):
+    global _X, _y
+    _X = np.load(x_path, mmap_mode='r')
+    _y = np.load(y_path, mmap_mode='r')
+
+def _median_call_time(fn, X):
+    times = []
+    for _ in range(LATENCY_REPEATS):
+        start = time.perf_counter()
+        fn(X)
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+def _fit_and_score(params):
+    model = IsolationForest(n_jobs=1, **FIXED_MODEL_KWARGS, **params)
+
+    start = time.perf_counter()
+    model.fit(_X)
+    fit_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    predicted = model.predict(_X) == -1
+    infer_time = time.perf_counter() - start
+
+    # What /detect pays per call: one reading, or one flushed micro-batch
+    single_time = _median_call_time(model.decision_function, np.asarray(_X[:1]))
+    batch_time = _median_call_time(model.decision_function, np.asarray(_X[:MICRO_BATCH_SIZE]))
+
+    precision, recall, f1, _ = precision_recall_fscore_support(
+        _y, predicted, average='binary', zero_division=0
+    )
+
+    return {
+        'params': params,
+        'precision': float(precision),
+        'recall': float(recall),
+        'f1': float(f1),
+        'fit_time_s': fit_time,
+        'throughput_us_per_row': infer_time / len(_X) * 1e6,
+        'latency_ms_single': single_time * 1e3,
+        'latency_ms_batch': batch_time * 1e3,
+        'model_bytes': len(pickle.dumps(model))
+    }
+
+def build_configs(n_random=None, seed=42):
+    keys = list(PARAM_GRID)
+    grid = [dict(zip(keys, values)) for values in product(*PARAM_GRID.values())]
+    if n_random and n_random < len(grid):
+        return random.Random(seed).sample(grid, n_random)
+    return grid
+
+def load_labelled_data(trainer):
+    df = trainer.load_data()
+    if 'is_injected' not in df:
+        print("Data has no injected-anomaly labels, generating labelled data...")
+        from data_generator import generate_mohali_dataset, inject_anomalies
+        df = inject_anomalies(generate_mohali_dataset(days=30, interval_minutes=5), anomaly_rate=0.02)
+    return trainer.preprocess(df)
+
+def run_sweep(configs, workers=None):
+    trainer = AnomalyModelTrainer()
+    df = load_labelled_data(trainer)
+
+    # Preprocess and scale once; workers memory-map the result
+    X = StandardScaler().fit_transform(df[trainer.feature_cols].values)
+    y = df['is_injected'].to_numpy(dtype=bool)
+    print(f"Sweeping {len(configs)} configurations over {len(X)} records")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        x_path = os.path.join(tmp, 'X.npy')
+        y_path = os.path.join(tmp, 'y.npy')
+        np.save(x_path, X)
+        np.save(y_path, y)
+
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(x_path, y_path)
+        ) as pool:
+            return list(pool.map(_fit_and_score, configs))
+
+def select_model(results, min_f1):
+    """Smallest, then fastest, configuration that meets the accuracy bar."""
+    passing = [r for r in results if r['f1'] >= min_f1]
+    if not passing:
+        return None
+    return min(passing, key=lambda r: (r['model_bytes'], r['latency_ms_single']))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Hyperparameter sweep for the anomaly model')
+    parser.add_argument('--random', type=int, default=None, help='Sample N configurations instead of the full grid')
+    parser.add_argument('--workers', type=int, default=None, help='Process pool size (default: CPU count)')
+    parser.add_argument('--min-f1', type=float, default=0.25, help='Accuracy bar for model selection')
+    args = parser.parse_args()
+
+    results = run_sweep(build_configs(args.random), workers=args.workers)
+    results.sort(key=lambda r: r['f1'], reverse=True)
+
+    print("\n" + "="*50)
+    print("Sweep Results (by F1):")
+    for r in results:
+        print(f"  {r['params']}")
+        print(f"    P={r['precision']:.3f} R={r['recall']:.3f} F1={r['f1']:.3f} "
+              f"fit={r['fit_time_s']:.2f}s latency={r['latency_ms_single']:.2f}ms "
+              f"(batch of {MICRO_BATCH_SIZE}: {r['latency_ms_batch']:.2f}ms) "
+              f"bulk={r['throughput_us_per_row']:.2f}us/row "
+              f"size={r['model_bytes'] / 1024:.0f}KB")
+
+    best = select_model(results, args.min_f1)
+    print("\n" + "="*50)
+    if best:
+        print(f"Selected (F1 >= {args.min_f1}): {best['params']}")
+    else:
+        print(f"No configuration reached F1 >= {args.min_f1}")
+
+    output_path = os.path.join(os.path.dirname(__file__), '..', 'models', 'sweep_results.json')
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, 'w') as f:
+        json.dump({'min_f1': args.min_f1, 'selected': best, 'results': results}, f, indent=2)
+    print(f"Results saved to {output_path}")
@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 import os
+import json
+import argparse
 import joblib
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler
@@ -9,19 +11,33 @@ from datetime import datetime
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import MOHALI_CONFIG
+from schema import TIMEZONE, SENSOR_DTYPES, load_dataset, save_dataset, to_local_datetime, memory_mb
+
+# Shared with sweep_anomaly_model.py so sweep scores describe the shipped model
+FIXED_MODEL_KWARGS = {'random_state': 42, 'bootstrap': True}
+DEFAULT_MODEL_PARAMS = {'n_estimators': 200, 'max_samples': 'auto', 'max_features': 1.0}
+
+def load_sweep_params(path):
+    """Hyperparameters of the configuration selected by a sweep run."""
+    with open(path) as f:
+        selected = json.load(f).get('selected')
+    if not selected:
+        raise ValueError(f"No configuration was selected in {path}")
+    return selected['params']
 
 class AnomalyModelTrainer:
     def __init__(self):
         self.model = None
         self.scaler = None
         self.feature_cols = ['noise', 'temperature', 'air_quality', 'crowd_density']
+        self.data = None
         self.models_dir = os.path.join(os.path.dirname(__file__), '..', 'models')
         os.makedirs(self.models_dir, exist_ok=True)
     
     def load_data(self, data_path=None):
         if data_path is None:
             data_path = os.path.join(
-                os.path.dirname(__file__), '..', 'data', 'processed', 'mohali_sensor_data.csv'
+                os.path.dirname(__file__), '..', 'data', 'processed', 'mohali_sensor_data.parquet'
             )
         
         if not os.path.exists(data_path):
@@ -30,47 +46,49 @@ class AnomalyModelTrainer:
             from data_generator import generate_mohali_dataset, inject_anomalies
             df = generate_mohali_dataset(days=30, interval_minutes=5)
             df = inject_anomalies(df, anomaly_rate=0.02)
-            os.makedirs(os.path.dirname(data_path), exist_ok=True)
-            df.to_csv(data_path, index=False)
+            save_dataset(df, data_path)
         
-        return pd.read_csv(data_path)
+        return load_dataset(data_path)
     
     def preprocess(self, df):
         df = df.copy()
         
-        # Parse timestamp
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df['hour'] = df['timestamp'].dt.hour
-        df['day_of_week'] = df['timestamp'].dt.dayofweek
-        df['month'] = df['timestamp'].dt.month
+        # Epoch timestamps stay int64; calendar features use local Mohali time
+        local_time = to_local_datetime(df['timestamp'])
+        df['hour'] = local_time.dt.hour.astype('int8')
+        df['day_of_week'] = local_time.dt.dayofweek.astype('int8')
+        df['month'] = local_time.dt.month.astype('int8')
         
         # Add time-based features
-        df['is_peak_hour'] = df['hour'].isin([8, 9, 17, 18, 19]).astype(int)
-        df['is_weekend'] = (df['day_of_week'] >= 5).astype(int)
+        df['is_peak_hour'] = df['hour'].isin([8, 9, 17, 18, 19]).astype('int8')
+        df['is_weekend'] = (df['day_of_week'] >= 5).astype('int8')
         
         return df
     
-    def calculate_stress_index(self, row):
-        n_score = min(((row['noise'] - 40) / 60) * 100, 100)
-        t_score = min(((row['temperature'] - 15) / 25) * 100, 100)
-        a_score = min((row['air_quality'] / 150) * 100, 100)
-        d_score = min((row['crowd_density'] / 30) * 100, 100)
+    def calculate_stress_index(self, df):
+        n_score = np.minimum(((df['noise'].astype(float) - 40) / 60) * 100, 100)
+        t_score = np.minimum(((df['temperature'].astype(float) - 15) / 25) * 100, 100)
+        a_score = np.minimum((df['air_quality'].astype(float) / 150) * 100, 100)
+        d_score = np.minimum((df['crowd_density'].astype(float) / 30) * 100, 100)
         
-        return max(0, round(
+        return np.maximum(0, np.round(
             (n_score * 0.4) + (t_score * 0.25) + (a_score * 0.2) + (d_score * 0.15)
-        ))
+        )).astype(SENSOR_DTYPES['stress_index'])
     
-    def train(self, contamination=0.02):
+    def train(self, contamination=0.02, params=None):
+        params = {**DEFAULT_MODEL_PARAMS, 'contamination': contamination, **(params or {})}
+        
         print("Loading data...")
         df = self.load_data()
         
-        print(f"Loaded {len(df)} records")
-        print(f"Date range: {df['timestamp'].min()} to {df['timestamp'].max()}")
+        print(f"Loaded {len(df)} records ({memory_mb(df):.1f} MB)")
+        date_range = to_local_datetime(df['timestamp'].agg(['min', 'max']))
+        print(f"Date range: {date_range.iloc[0]} to {date_range.iloc[1]}")
         
         df = self.preprocess(df)
         
         # Calculate stress index
-        df['stress_index'] = df.apply(self.calculate_stress_index, axis=1)
+        df['stress_index'] = self.calculate_stress_index(df)
         
         # Prepare features
         X = df[self.feature_cols].values
@@ -79,16 +97,9 @@ class AnomalyModelTrainer:
         self.scaler = StandardScaler()
         X_scaled = self.scaler.fit_transform(X)
         
-        print(f"Training Isolation Forest (contamination={contamination})...")
+        print(f"Training Isolation Forest ({params})...")
         
-        self.model = IsolationForest(
-            n_estimators=200,
-            contamination=contamination,
-            max_samples='auto',
-            random_state=42,
-            n_jobs=-1,
-            bootstrap=True
-        )
+        self.model = IsolationForest(n_jobs=-1, **FIXED_MODEL_KWARGS, **params)
         
         self.model.fit(X_scaled)
         
@@ -109,6 +120,8 @@ class AnomalyModelTrainer:
         print(f"  Average stress index (normal): {df[~df['is_anomaly']]['stress_index'].mean():.1f}")
         print(f"  High stress (>80) in anomalies: {(anomalies['stress_index'] > 80).sum()}")
         
+        self.data = df
+        
         # Save model
         self.save()
         
@@ -131,8 +144,11 @@ class AnomalyModelTrainer:
         print(f"Scaler saved to {scaler_path}")
     
     def evaluate_samples(self, n_samples=10):
-        df = self.load_data()
-        df = self.preprocess(df)
+        # Reuse the frame prepared by train() instead of re-reading the CSV
+        if self.data is not None:
+            df = self.data.copy()
+        else:
+            df = self.preprocess(self.load_data())
         
         X = df[self.feature_cols].values
         X_scaled = self.scaler.transform(X)
@@ -142,22 +158,29 @@ class AnomalyModelTrainer:
         
         df['anomaly_pred'] = predictions == -1
         df['anomaly_score'] = -scores  # Higher score = more anomalous
-        df['stress_index'] = df.apply(self.calculate_stress_index, axis=1)
+        if 'stress_index' not in df:
+            df['stress_index'] = self.calculate_stress_index(df)
         
         print("\nSample Anomalies:")
         anomalies = df[df['anomaly_pred']].nlargest(n_samples, 'anomaly_score')
         
         for _, row in anomalies.iterrows():
-            print(f"  {row['node_id']} @ {row['timestamp']}")
+            print(f"  {row['node_id']} @ {pd.Timestamp(row['timestamp'], unit='s', tz='UTC').tz_convert(TIMEZONE)}")
             print(f"    Stress: {row['stress_index']}, Score: {row['anomaly_score']:.3f}")
-            print(f"    Noise: {row['noise']}, Temp: {row['temperature']}, AQI: {row['air_quality']}, Crowd: {row['crowd_density']}")
+            print(f"    Noise: {row['noise']:.1f}, Temp: {row['temperature']:.1f}, AQI: {row['air_quality']}, Crowd: {row['crowd_density']}")
             print()
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Train the anomaly model')
+    parser.add_argument('--params-from', default=None,
+                        help='sweep_results.json whose selected configuration to train')
+    args = parser.parse_args()
+    
     trainer = AnomalyModelTrainer()
+    params = load_sweep_params(args.params_from) if args.params_from else None
     
-    # Train with 2% contamination rate (expected anomaly rate)
-    results = trainer.train(contamination=0.02)
+    # Train with 2% contamination rate (expected anomaly rate) unless the sweep picked one
+    results = trainer.train(contamination=0.02, params=params)
     
     print("\n" + "="*50)
     print("Training Results:")